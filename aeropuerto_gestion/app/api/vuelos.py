@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import List, Optional, Union
+from datetime import date, datetime
+from pydantic import BaseModel, Field, root_validator
 
 from app.models.vuelo import Vuelo, EstadoVuelo, TipoVuelo
 from app.services.vuelo_service import vuelo_service
@@ -41,9 +41,55 @@ class VueloResponse(VueloBase):
     class Config:
         orm_mode = True
 
+class VueloArchivadoResponse(VueloResponse):
+    hora_archivo: datetime
+
+# Consultas por ID que también resuelven vuelos archivados (con hora_archivo)
+VueloActivoOArchivadoResponse = Union[VueloArchivadoResponse, VueloResponse]
+
 class PositionUpdate(BaseModel):
     posicion: int = Field(..., ge=0, description="Nueva posición en la lista")
 
+class MovimientoRelativo(BaseModel):
+    antes_de: Optional[int] = Field(default=None, description="ID del vuelo delante del cual se coloca")
+    despues_de: Optional[int] = Field(default=None, description="ID del vuelo detrás del cual se coloca")
+    
+    @root_validator(skip_on_failure=True)
+    def validar_un_ancla(cls, valores):
+        if (valores.get("antes_de") is None) == (valores.get("despues_de") is None):
+            raise ValueError("Debe indicarse exactamente uno de antes_de o despues_de")
+        return valores
+
+# Máximo de IDs aceptados en una consulta por lotes
+MAX_IDS_POR_CONSULTA = 500
+
+def _parsear_ids(ids: str) -> List[int]:
+    """Convierte una lista de IDs separados por comas ("1,2,3") en enteros."""
+    try:
+        vuelo_ids = [int(parte) for parte in ids.split(",") if parte.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids debe ser una lista de enteros separados por comas"
+        )
+    if len(vuelo_ids) > MAX_IDS_POR_CONSULTA:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No se pueden pedir más de {MAX_IDS_POR_CONSULTA} vuelos a la vez"
+        )
+    return vuelo_ids
+
+# Respuestas pre-codificadas: evitan validar cada Vuelo con VueloResponse y
+# volver a codificarlo en cada petición de lectura
+def _respuesta_vuelo(vuelo: Vuelo) -> Response:
+    """Construye la respuesta JSON de un vuelo a partir de su forma cacheada."""
+    return Response(content=vuelo.a_json(), media_type="application/json")
+
+def _respuesta_vuelos(vuelos: List[Vuelo]) -> Response:
+    """Construye la respuesta JSON de una lista uniendo los fragmentos cacheados."""
+    contenido = b"[" + b",".join([vuelo.a_json() for vuelo in vuelos]) + b"]"
+    return Response(content=contenido, media_type="application/json")
+
 # Endpoints
 @router.post("/", response_model=VueloResponse, status_code=status.HTTP_201_CREATED)
 async def crear_vuelo(vuelo_data: VueloCreate, db: Session = Depends(get_db)):
@@ -74,11 +120,21 @@ async def crear_vuelo(vuelo_data: VueloCreate, db: Session = Depends(get_db)):
             detail=f"Error al crear vuelo: {str(e)}"
         )
 
-@router.get("/", response_model=List[VueloResponse])
-async def obtener_todos_los_vuelos(db: Session = Depends(get_db)):
-    """Obtiene todos los vuelos en el orden actual de la lista."""
+@router.get("/", response_model=List[VueloActivoOArchivadoResponse])
+async def obtener_todos_los_vuelos(
+    ids: Optional[str] = Query(None, description="IDs separados por comas para obtener sólo esos vuelos (ej: 1,2,3)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene todos los vuelos en el orden actual de la lista, o sólo los indicados
+    en ids, en el orden pedido y omitiendo los que no existen.
+    """
     try:
-        return vuelo_service.obtener_todos_los_vuelos(db)
+        if ids is not None:
+            return _respuesta_vuelos(vuelo_service.obtener_vuelos_por_ids(_parsear_ids(ids), db))
+        return _respuesta_vuelos(vuelo_service.obtener_todos_los_vuelos(db))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error al obtener vuelos: {str(e)}")
         raise HTTPException(
@@ -96,7 +152,7 @@ async def obtener_proximo_vuelo(db: Session = Depends(get_db)):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No hay vuelos programados"
             )
-        return vuelo
+        return _respuesta_vuelo(vuelo)
     except HTTPException:
         raise
     except Exception as e:
@@ -106,9 +162,26 @@ async def obtener_proximo_vuelo(db: Session = Depends(get_db)):
             detail=f"Error al obtener próximo vuelo: {str(e)}"
         )
 
-@router.get("/{vuelo_id}", response_model=VueloResponse)
+@router.get("/historial", response_model=List[VueloArchivadoResponse])
+async def obtener_historial(
+    fecha: Optional[date] = Query(None, description="Día de archivo (AAAA-MM-DD)"),
+    limite: int = Query(100, ge=1, le=1000),
+    desplazamiento: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Obtiene los vuelos archivados (finalizados o cancelados), del más reciente al más antiguo."""
+    try:
+        return _respuesta_vuelos(vuelo_service.obtener_historial(db, fecha, limite, desplazamiento))
+    except Exception as e:
+        print(f"Error al obtener historial: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener historial: {str(e)}"
+        )
+
+@router.get("/{vuelo_id}", response_model=VueloActivoOArchivadoResponse)
 async def obtener_vuelo_por_id(vuelo_id: int, db: Session = Depends(get_db)):
-    """Obtiene un vuelo específico por su ID."""
+    """Obtiene un vuelo específico por su ID (los archivados incluyen además hora_archivo)."""
     try:
         vuelo = vuelo_service.obtener_vuelo_por_id(vuelo_id, db)
         if not vuelo:
@@ -116,7 +189,7 @@ async def obtener_vuelo_por_id(vuelo_id: int, db: Session = Depends(get_db)):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Vuelo con ID {vuelo_id} no encontrado"
             )
-        return vuelo
+        return _respuesta_vuelo(vuelo)
     except HTTPException:
         raise
     except Exception as e:
@@ -208,4 +281,26 @@ async def mover_a_posicion(vuelo_id: int, posicion_data: PositionUpdate, db: Ses
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al mover vuelo: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/{vuelo_id}/mover", response_model=VueloResponse)
+async def mover_relativo(vuelo_id: int, movimiento: MovimientoRelativo, db: Session = Depends(get_db)):
+    """Mueve un vuelo justo antes o justo después de otro vuelo de la lista."""
+    try:
+        antes = movimiento.antes_de is not None
+        ancla_id = movimiento.antes_de if antes else movimiento.despues_de
+        vuelo_movido = vuelo_service.mover_vuelo_relativo(vuelo_id, ancla_id, antes, db)
+        if not vuelo_movido:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Vuelo con ID {vuelo_id} no encontrado"
+            )
+        return vuelo_movido
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error al mover vuelo: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al mover vuelo: {str(e)}"
+        )
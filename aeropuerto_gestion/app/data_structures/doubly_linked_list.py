@@ -1,14 +1,63 @@
+from itertools import chain
+
+
+class Instantanea:
+    """
+    Versión inmutable del contenido de una DoublyLinkedList.
+    
+    Se compone de bloques (tuplas) de vuelos consecutivos. Las versiones sucesivas
+    comparten los bloques que no cambiaron, así que publicar una versión nueva tras
+    una escritura sólo copia el bloque afectado y la tupla de referencias a bloques.
+    """
+    __slots__ = '_bloques', '_longitud'
+    
+    def __init__(self, bloques=(), longitud=0):
+        self._bloques = bloques    # Tupla de tuplas de vuelos
+        self._longitud = longitud  # Número total de vuelos
+    
+    def __len__(self):
+        """Retorna el número de vuelos de la versión."""
+        return self._longitud
+    
+    def __iter__(self):
+        """Recorre los vuelos en orden."""
+        return chain.from_iterable(self._bloques)
+    
+    def __getitem__(self, posicion):
+        """Retorna el vuelo en la posición dada (admite índices negativos)."""
+        if posicion < 0:
+            posicion += self._longitud
+        if not 0 <= posicion < self._longitud:
+            raise IndexError("Posición fuera de rango")
+        for bloque in self._bloques:
+            if posicion < len(bloque):
+                return bloque[posicion]
+            posicion -= len(bloque)
+
+
 class DoublyLinkedList:
     """Implementación de una lista doblemente enlazada para gestionar vuelos."""
     
+    # Tamaño objetivo de los bloques de la instantánea (se dividen al doblarlo)
+    _TAMANO_BLOQUE = 128
+    
     class _Node:
         """Clase interna para representar un nodo en la lista doblemente enlazada."""
-        __slots__ = '_element', '_prev', '_next'
+        __slots__ = '_element', '_prev', '_next', '_bloque'
         
         def __init__(self, element, prev=None, next=None):
             self._element = element  # Referencia al vuelo
             self._prev = prev        # Referencia al nodo anterior
             self._next = next        # Referencia al nodo siguiente
+            self._bloque = None      # Bloque de la instantánea al que pertenece
+    
+    class _Bloque:
+        """Clase interna para un tramo de nodos consecutivos y su tupla publicada."""
+        __slots__ = 'nodos', 'tupla'
+        
+        def __init__(self, nodos=None):
+            self.nodos = nodos if nodos is not None else []  # Nodos en orden
+            self.tupla = None  # Vuelos del bloque ya publicados (None si cambió)
     
     def __init__(self):
         """Crea una lista vacía."""
@@ -17,6 +66,8 @@ class DoublyLinkedList:
         self._header._next = self._trailer  # El header apunta al trailer
         self._trailer._prev = self._header  # El trailer apunta al header
         self._size = 0  # Número de elementos en la lista
+        self._bloques = []  # Bloques de nodos en orden, base de la instantánea
+        self._instantanea = Instantanea()  # Última versión inmutable construida
     
     def __len__(self):
         """Retorna el número de elementos en la lista."""
@@ -36,10 +87,12 @@ class DoublyLinkedList:
         predecessor._next = nuevo  # Enlaza el predecesor al nuevo nodo
         successor._prev = nuevo    # Enlaza el sucesor al nuevo nodo
         self._size += 1            # Incrementa el tamaño
+        self._asignar_bloque(nuevo)
         return nuevo
     
     def _eliminar_nodo(self, node):
         """Elimina un nodo de la lista y retorna su elemento."""
+        self._desasignar_bloque(node)
         predecessor = node._prev
         successor = node._next
         predecessor._next = successor
@@ -49,6 +102,63 @@ class DoublyLinkedList:
         node._prev = node._next = node._element = None  # Limpia el nodo
         return element
     
+    def _asignar_bloque(self, node):
+        """Ubica un nodo recién enlazado en el bloque de su vecino, dividiéndolo si crece demasiado."""
+        predecessor, successor = node._prev, node._next
+        if predecessor is not self._header:
+            bloque = predecessor._bloque
+            if bloque.nodos[-1] is predecessor:
+                bloque.nodos.append(node)
+            else:
+                bloque.nodos.insert(bloque.nodos.index(predecessor) + 1, node)
+        elif successor is not self._trailer:
+            bloque = successor._bloque
+            bloque.nodos.insert(0, node)
+        else:
+            bloque = self._Bloque([node])
+            self._bloques.append(bloque)
+        node._bloque = bloque
+        bloque.tupla = None
+        self._instantanea = None   # La versión publicada ya no es la actual
+        
+        if len(bloque.nodos) > 2 * self._TAMANO_BLOQUE:
+            mitad = len(bloque.nodos) // 2
+            nuevo = self._Bloque(bloque.nodos[mitad:])
+            del bloque.nodos[mitad:]
+            for movido in nuevo.nodos:
+                movido._bloque = nuevo
+            self._bloques.insert(self._bloques.index(bloque) + 1, nuevo)
+    
+    def _desasignar_bloque(self, node):
+        """Quita un nodo de su bloque, fusionando bloques que quedan demasiado pequeños."""
+        bloque = node._bloque
+        bloque.nodos.remove(node)
+        bloque.tupla = None
+        node._bloque = None
+        self._instantanea = None   # La versión publicada ya no es la actual
+        
+        if len(bloque.nodos) >= self._TAMANO_BLOQUE // 4:
+            return
+        indice = self._bloques.index(bloque)
+        if not bloque.nodos:
+            del self._bloques[indice]
+        elif indice + 1 < len(self._bloques) and \
+                len(bloque.nodos) + len(self._bloques[indice + 1].nodos) <= 2 * self._TAMANO_BLOQUE:
+            # Absorber el bloque siguiente sin superar el límite de división
+            siguiente = self._bloques.pop(indice + 1)
+            for movido in siguiente.nodos:
+                movido._bloque = bloque
+            bloque.nodos.extend(siguiente.nodos)
+        elif indice > 0 and \
+                len(bloque.nodos) + len(self._bloques[indice - 1].nodos) <= 2 * self._TAMANO_BLOQUE:
+            # Si no, se integra en el anterior
+            anterior = self._bloques[indice - 1]
+            for movido in bloque.nodos:
+                movido._bloque = anterior
+            anterior.nodos.extend(bloque.nodos)
+            anterior.tupla = None
+            del self._bloques[indice]
+    
     def insertar_al_frente(self, e):
         """Añade un vuelo al inicio de la lista (para emergencias)."""
         return self._insertar_entre(e, self._header, self._header._next)
@@ -86,16 +196,11 @@ class DoublyLinkedList:
         if not 0 <= posicion < self._size:
             raise IndexError("Posición fuera de rango")
         
-        if posicion < self._size // 2:  # Más cercano al inicio
-            current = self._header._next
-            for _ in range(posicion):
-                current = current._next
-        else:  # Más cercano al final
-            current = self._trailer._prev
-            for _ in range(self._size - 1 - posicion):
-                current = current._prev
-        
-        return current
+        # Saltar bloque a bloque en lugar de nodo a nodo
+        for bloque in self._bloques:
+            if posicion < len(bloque.nodos):
+                return bloque.nodos[posicion]
+            posicion -= len(bloque.nodos)
     
     def insertar_en_posicion(self, e, posicion):
         """Inserta un vuelo en una posición específica."""
@@ -123,9 +228,69 @@ class DoublyLinkedList:
             node = self._obtener_nodo_en_posicion(posicion)
             return self._eliminar_nodo(node)
     
+    def elemento(self, node):
+        """Retorna el vuelo de un nodo obtenido al insertarlo (None si ya fue extraído)."""
+        return node._element
+    
+    def extraer_nodo(self, node):
+        """Remueve y retorna el vuelo de un nodo obtenido al insertarlo, sin recorrer la lista (ver _reubicar)."""
+        return self._eliminar_nodo(node)
+    
+    def _reubicar(self, node, ancla, antes):
+        """
+        Desenlaza un nodo y lo vuelve a enlazar junto al nodo ancla, sin crear uno nuevo.
+        
+        No recorre la lista por posiciones: el re-enlace es O(1), pero mantener los
+        bloques de la instantánea cuesta O(_TAMANO_BLOQUE) por la búsqueda dentro
+        del bloque, más O(n / _TAMANO_BLOQUE) si un bloque se divide o se fusiona.
+        """
+        if node is ancla:
+            raise ValueError("Un vuelo no puede moverse respecto de sí mismo")
+        # Desenlazar de su posición actual
+        self._desasignar_bloque(node)
+        node._prev._next = node._next
+        node._next._prev = node._prev
+        # Enlazar antes o después del ancla (calculado tras desenlazar)
+        predecessor, successor = (ancla._prev, ancla) if antes else (ancla, ancla._next)
+        node._prev = predecessor
+        node._next = successor
+        predecessor._next = node
+        successor._prev = node
+        self._asignar_bloque(node)
+        return node._element
+    
+    def mover_antes(self, node, ancla):
+        """Mueve el nodo justo antes del nodo ancla (costo en _reubicar) y retorna su vuelo."""
+        return self._reubicar(node, ancla, antes=True)
+    
+    def mover_despues(self, node, ancla):
+        """Mueve el nodo justo después del nodo ancla (costo en _reubicar) y retorna su vuelo."""
+        return self._reubicar(node, ancla, antes=False)
+    
     def __iter__(self):
         """Iterador para recorrer la lista del principio al final."""
         current = self._header._next
         while current is not self._trailer:
             yield current._element
-            current = current._next
\ No newline at end of file
+            current = current._next
+    
+    def instantanea(self):
+        """
+        Retorna la versión inmutable (Instantanea) del contenido actual de la lista.
+        
+        La versión se construye una sola vez y se reutiliza mientras la lista no
+        cambie, por lo que obtenerla de nuevo es O(1). Quien la recibe puede
+        recorrerla libremente aunque la lista se modifique después. Tras una
+        escritura sólo se vuelven a copiar los bloques modificados (de
+        _TAMANO_BLOQUE a 2 * _TAMANO_BLOQUE vuelos) y la tupla de bloques; el
+        resto se comparte con la versión anterior, que se libera en cuanto el
+        último lector suelta su referencia.
+        """
+        if self._instantanea is None:
+            bloques = []
+            for bloque in self._bloques:
+                if bloque.tupla is None:
+                    bloque.tupla = tuple([node._element for node in bloque.nodos])
+                bloques.append(bloque.tupla)
+            self._instantanea = Instantanea(tuple(bloques), self._size)
+        return self._instantanea
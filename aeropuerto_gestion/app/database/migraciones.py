@@ -0,0 +1,59 @@
+from sqlalchemy import MetaData, text
+from sqlalchemy.engine import Engine
+
+from app.models.db_models import VueloModel, VueloArchivadoModel
+
+
+def asegurar_ids_unicos(engine: Engine):
+    """
+    Garantiza que los IDs de vuelo nunca se reutilicen, ni siquiera los de vuelos
+    ya archivados o eliminados.
+    
+    La tabla de vuelos usa AUTOINCREMENT de SQLite: el contador vive en
+    sqlite_sequence y se actualiza en la misma transacción del INSERT, así que
+    dos altas concurrentes no pueden recibir el mismo ID. Las bases creadas antes
+    de este cambio se migran una sola vez reconstruyendo la tabla, y el contador
+    se adelanta al mayor ID existente entre vuelos activos y archivados.
+    
+    Todo ocurre en una única transacción y la tabla reconstruida sólo reemplaza
+    a la original al final, así que una migración interrumpida deja la tabla
+    original intacta y se repite en el siguiente arranque.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    
+    tabla = VueloModel.__tablename__
+    with engine.begin() as conn:
+        # pysqlite no abre la transacción antes de sentencias DDL (ALTER, CREATE,
+        # DROP) y las confirmaría una a una: se abre explícitamente
+        conn.exec_driver_sql("BEGIN")
+        definicion = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :tabla"),
+            {"tabla": tabla}
+        ).scalar()
+        if definicion is None:
+            return
+        
+        if "AUTOINCREMENT" not in definicion.upper():
+            # Migración única: copiar las filas a una tabla nueva con AUTOINCREMENT
+            # y sustituir la original sólo cuando la copia está completa
+            nueva = VueloModel.__table__.to_metadata(MetaData(), name=f"{tabla}_nueva")
+            columnas = ", ".join(columna.name for columna in VueloModel.__table__.columns)
+            conn.execute(text(f"DROP TABLE IF EXISTS {nueva.name}"))  # Restos de un intento anterior
+            nueva.create(conn)
+            conn.execute(text(f"INSERT INTO {nueva.name} ({columnas}) SELECT {columnas} FROM {tabla}"))
+            conn.execute(text(f"DROP TABLE {tabla}"))
+            conn.execute(text(f"ALTER TABLE {nueva.name} RENAME TO {tabla}"))
+        
+        # Adelantar el contador por encima de cualquier ID ya usado (incluidos los archivados)
+        maximo = conn.execute(text(
+            f"SELECT MAX(id) FROM (SELECT id FROM {tabla} UNION ALL "
+            f"SELECT id FROM {VueloArchivadoModel.__tablename__})"
+        )).scalar() or 0
+        actual = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = :tabla"), {"tabla": tabla}).scalar()
+        if actual is None:
+            conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:tabla, :seq)"),
+                         {"tabla": tabla, "seq": maximo})
+        elif actual < maximo:
+            conn.execute(text("UPDATE sqlite_sequence SET seq = :seq WHERE name = :tabla"),
+                         {"tabla": tabla, "seq": maximo})
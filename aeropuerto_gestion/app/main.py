@@ -4,15 +4,17 @@ import uvicorn
 
 # Importaciones de base de datos
 from app.database.db import Base, engine
+from app.database.migraciones import asegurar_ids_unicos
 
 # Importar explícitamente todos los modelos antes de crear las tablas
-from app.models.db_models import VueloModel
+from app.models.db_models import VueloModel, VueloArchivadoModel
 
 # Importaciones de rutas
 from app.api.vuelos import router as vuelos_router
 
 # Crear las tablas en la base de datos
 Base.metadata.create_all(bind=engine)
+asegurar_ids_unicos(engine)
 
 # Crear la aplicación FastAPI
 app = FastAPI(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, ForeignKey
 from datetime import datetime
 from app.models.vuelo import EstadoVuelo, TipoVuelo
 from app.database.db import Base  # Importar Base desde db.py en lugar de redefinirla
@@ -7,6 +7,8 @@ class VueloModel(Base):
     """Modelo SQLAlchemy para la tabla de vuelos."""
     
     __tablename__ = 'vuelos'
+    # Los IDs no se reutilizan aunque el vuelo pase al archivo o se elimine
+    __table_args__ = {'sqlite_autoincrement': True}
     
     id = Column(Integer, primary_key=True)
     codigo = Column(String(20), unique=True, nullable=False)
@@ -23,7 +25,7 @@ class VueloModel(Base):
         """Convierte el modelo de base de datos a un objeto Vuelo."""
         from app.models.vuelo import Vuelo
         
-        return Vuelo(
+        vuelo = Vuelo(
             id=self.id,
             codigo=self.codigo,
             aerolinea=self.aerolinea,
@@ -34,6 +36,9 @@ class VueloModel(Base):
             estado=self.estado,
             prioridad=self.prioridad
         )
+        if self.hora_actualizacion is not None:
+            vuelo.hora_actualizacion = self.hora_actualizacion  # Conservar la hora guardada
+        return vuelo
     
     @classmethod
     def from_vuelo(cls, vuelo):
@@ -49,4 +54,68 @@ class VueloModel(Base):
             estado=vuelo.estado,
             prioridad=vuelo.prioridad,
             hora_actualizacion=vuelo.hora_actualizacion
-        )
\ No newline at end of file
+        )
+
+
+class VueloArchivadoModel(Base):
+    """
+    Modelo SQLAlchemy para la tabla de vuelos archivados.
+    
+    Guarda los vuelos que llegaron a un estado terminal (finalizado o cancelado)
+    para que la tabla de vuelos y la lista en memoria sólo contengan tráfico vivo.
+    Conserva el ID original del vuelo y se particiona lógicamente por día de archivo.
+    """
+    
+    __tablename__ = 'vuelos_archivados'
+    
+    id = Column(Integer, primary_key=True)
+    codigo = Column(String(20), nullable=False, index=True)  # Un código puede repetirse en días distintos
+    aerolinea = Column(String(100), nullable=False)
+    origen = Column(String(100), nullable=False)
+    destino = Column(String(100), nullable=False)
+    hora_programada = Column(DateTime, nullable=False)
+    tipo = Column(Enum(TipoVuelo), default=TipoVuelo.COMERCIAL)
+    estado = Column(Enum(EstadoVuelo), nullable=False)
+    prioridad = Column(Integer, default=0)
+    hora_actualizacion = Column(DateTime, default=datetime.now)
+    hora_archivo = Column(DateTime, default=datetime.now, nullable=False)
+    fecha_archivo = Column(Date, default=lambda: datetime.now().date(), nullable=False, index=True)
+    
+    def to_vuelo(self):
+        """Convierte el modelo archivado a un objeto Vuelo, incluyendo su hora de archivo."""
+        from app.models.vuelo import Vuelo
+        
+        vuelo = Vuelo(
+            id=self.id,
+            codigo=self.codigo,
+            aerolinea=self.aerolinea,
+            origen=self.origen,
+            destino=self.destino,
+            hora_programada=self.hora_programada,
+            tipo=self.tipo,
+            estado=self.estado,
+            prioridad=self.prioridad
+        )
+        if self.hora_actualizacion is not None:
+            vuelo.hora_actualizacion = self.hora_actualizacion
+        vuelo.hora_archivo = self.hora_archivo
+        return vuelo
+    
+    @classmethod
+    def from_modelo(cls, vuelo_db: VueloModel):
+        """Crea el registro de archivo a partir de un vuelo activo de la base de datos."""
+        ahora = datetime.now()
+        return cls(
+            id=vuelo_db.id,
+            codigo=vuelo_db.codigo,
+            aerolinea=vuelo_db.aerolinea,
+            origen=vuelo_db.origen,
+            destino=vuelo_db.destino,
+            hora_programada=vuelo_db.hora_programada,
+            tipo=vuelo_db.tipo,
+            estado=vuelo_db.estado,
+            prioridad=vuelo_db.prioridad,
+            hora_actualizacion=vuelo_db.hora_actualizacion,
+            hora_archivo=ahora,
+            fecha_archivo=ahora.date()
+        )
@@ -1,6 +1,19 @@
+import json
 from enum import Enum
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa el módulo json estándar
+    orjson = None
+
+
+def codificar_json(datos: Any) -> bytes:
+    """Codifica datos a JSON (bytes UTF-8) usando orjson si está disponible."""
+    if orjson is not None:
+        return orjson.dumps(datos)
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 class EstadoVuelo(str, Enum):
     """Enumeración para representar los posibles estados de un vuelo."""
@@ -22,6 +35,9 @@ class TipoVuelo(str, Enum):
     MILITAR = "MILITAR"
     EMERGENCIA_MEDICA = "EMERGENCIA_MEDICA"
 
+# Estados a partir de los cuales un vuelo ya no se despacha y pasa al archivo
+ESTADOS_TERMINALES = (EstadoVuelo.FINALIZADO, EstadoVuelo.CANCELADO)
+
 class Vuelo:
     """Clase para representar un vuelo en el sistema."""
     
@@ -59,6 +75,13 @@ class Vuelo:
         self.estado = estado
         self.prioridad = prioridad
         self.hora_actualizacion = datetime.now()
+        self.hora_archivo: Optional[datetime] = None  # Sólo en vuelos archivados
+    
+    def __setattr__(self, nombre, valor):
+        """Asigna el atributo e invalida la forma JSON cacheada del vuelo."""
+        object.__setattr__(self, nombre, valor)
+        if nombre != "_json":
+            object.__setattr__(self, "_json", None)
     
     def __repr__(self):
         """Representación en string del vuelo."""
@@ -81,4 +104,37 @@ class Vuelo:
         """Actualiza la prioridad del vuelo."""
         self.prioridad = nueva_prioridad
         self.hora_actualizacion = datetime.now()
-        return self
\ No newline at end of file
+        return self
+    
+    def a_dict(self) -> Dict[str, Any]:
+        """
+        Retorna el vuelo con los mismos campos y formato que VueloResponse
+        (VueloArchivadoResponse si el vuelo está archivado).
+        """
+        datos = {
+            "codigo": self.codigo,
+            "aerolinea": self.aerolinea,
+            "origen": self.origen,
+            "destino": self.destino,
+            "hora_programada": self.hora_programada.isoformat(),
+            "tipo": self.tipo.value,
+            "estado": self.estado.value,
+            "prioridad": self.prioridad,
+            "id": self.id,
+            "hora_actualizacion": self.hora_actualizacion.isoformat(),
+        }
+        if self.hora_archivo is not None:
+            datos["hora_archivo"] = self.hora_archivo.isoformat()
+        return datos
+    
+    def a_json(self) -> bytes:
+        """
+        Retorna el vuelo codificado en JSON.
+        
+        La codificación se cachea y se invalida en cuanto cambia cualquier
+        atributo (incluidos los mutadores de arriba), así que los listados sólo
+        codifican de nuevo los vuelos que realmente se modificaron.
+        """
+        if self._json is None:
+            self._json = codificar_json(self.a_dict())
+        return self._json
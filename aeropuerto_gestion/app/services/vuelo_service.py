@@ -1,11 +1,12 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
+from threading import RLock
 from typing import List, Optional, Dict, Any
 
-from app.data_structures.doubly_linked_list import DoublyLinkedList
-from app.models.vuelo import Vuelo, EstadoVuelo, TipoVuelo
-from app.models.db_models import VueloModel
+from app.data_structures.doubly_linked_list import DoublyLinkedList, Instantanea
+from app.models.vuelo import Vuelo, EstadoVuelo, TipoVuelo, ESTADOS_TERMINALES
+from app.models.db_models import VueloModel, VueloArchivadoModel
 from app.database.db import get_db
 
 class VueloService:
@@ -15,10 +16,47 @@ class VueloService:
         """Inicializa el servicio con una lista doblemente enlazada vacía."""
         self.lista_vuelos = DoublyLinkedList()
         self._cargar_vuelos_desde_db = False
-        
+        # Los escritores modifican la lista bajo este lock y al terminar publican
+        # una instantánea inmutable; los lectores sólo leen la última publicada.
+        self._lock = RLock()
+        self._vuelos_publicados: Instantanea = self.lista_vuelos.instantanea()
+        # Índice ID -> nodo de la lista, para ubicar vuelos sin recorrerla
+        self._nodos: Dict[int, Any] = {}
+    
+    def _publicar(self):
+        """Publica la versión actual de la lista para los lectores (llamar con el lock tomado)."""
+        self._vuelos_publicados = self.lista_vuelos.instantanea()
+    
+    def _insertar_en_lista(self, vuelo: Vuelo):
+        """Inserta un vuelo según prioridad/estado y lo registra en el índice (llamar con el lock tomado)."""
+        if vuelo.estado == EstadoVuelo.EMERGENCIA or vuelo.prioridad >= 90:
+            self._nodos[vuelo.id] = self.lista_vuelos.insertar_al_frente(vuelo)
+        else:
+            self._nodos[vuelo.id] = self.lista_vuelos.insertar_al_final(vuelo)
+    
+    def _quitar_de_lista(self, vuelo_id: int) -> Optional[Vuelo]:
+        """
+        Quita un vuelo de la lista usando el índice, sin recorrerla por posiciones
+        (O(tamaño de bloque + n / tamaño de bloque); llamar con el lock tomado).
+        """
+        nodo = self._nodos.pop(vuelo_id, None)
+        if nodo is None:
+            return None
+        return self.lista_vuelos.extraer_nodo(nodo)
+    
     def _cargar_db_si_necesario(self, db: Session):
         """Carga los vuelos desde la base de datos si no se han cargado todavía."""
-        if not self._cargar_vuelos_desde_db:
+        if self._cargar_vuelos_desde_db:
+            return
+        
+        with self._lock:
+            if self._cargar_vuelos_desde_db:
+                return
+            
+            # Sacar del conjunto activo lo que haya quedado finalizado o cancelado,
+            # para que la carga sea proporcional al tráfico vivo
+            self.archivar_vuelos_terminados(db)
+            
             # Obtener todos los vuelos y ordenarlos por prioridad (descendente) y hora programada
             vuelos_db = db.query(VueloModel).order_by(
                 VueloModel.prioridad.desc(),
@@ -28,14 +66,51 @@ class VueloService:
             # Limpiar la lista actual
             while not self.lista_vuelos.esta_vacia():
                 self.lista_vuelos.eliminar_primero()
+            self._nodos = {}
             
             # Cargar vuelos en la lista
             for vuelo_db in vuelos_db:
                 vuelo = vuelo_db.to_vuelo()
-                self.lista_vuelos.insertar_al_final(vuelo)
+                self._nodos[vuelo.id] = self.lista_vuelos.insertar_al_final(vuelo)
             
+            self._publicar()
             self._cargar_vuelos_desde_db = True
     
+    def _archivar(self, vuelo_db: VueloModel, db: Session) -> Vuelo:
+        """Mueve un vuelo de la tabla de vuelos al archivo en una sola transacción."""
+        archivado = VueloArchivadoModel.from_modelo(vuelo_db)
+        db.add(archivado)
+        if vuelo_db in db:
+            db.delete(vuelo_db)
+        db.commit()
+        db.refresh(archivado)
+        return archivado.to_vuelo()
+    
+    def archivar_vuelos_terminados(self, db: Session) -> int:
+        """
+        Archiva todos los vuelos activos que estén finalizados o cancelados.
+        Se ejecuta al cargar la lista y puede invocarse periódicamente.
+        Retorna el número de vuelos archivados.
+        """
+        terminados = db.query(VueloModel).filter(VueloModel.estado.in_(ESTADOS_TERMINALES)).all()
+        if not terminados:
+            return 0
+        
+        ids_archivados = set()
+        for vuelo_db in terminados:
+            ids_archivados.add(vuelo_db.id)
+            db.add(VueloArchivadoModel.from_modelo(vuelo_db))
+            db.delete(vuelo_db)
+        db.commit()
+        
+        # Quitar de la lista en memoria
+        with self._lock:
+            for vuelo_id in ids_archivados:
+                self._quitar_de_lista(vuelo_id)
+            self._publicar()
+        
+        return len(ids_archivados)
+    
     def agregar_vuelo(self, vuelo: Vuelo, db: Session) -> Vuelo:
         """
         Agrega un nuevo vuelo al sistema.
@@ -44,9 +119,16 @@ class VueloService:
         # Asegurarse de que la lista esté actualizada
         self._cargar_db_si_necesario(db)
         
-        # Crear y guardar en la base de datos
+        # Crear en la base de datos (el ID lo reserva la tabla de vuelos con AUTOINCREMENT)
         vuelo_db = VueloModel.from_vuelo(vuelo)
         db.add(vuelo_db)
+        
+        # Un vuelo que se registra ya finalizado o cancelado va directo al archivo,
+        # en la misma transacción en que recibe su ID
+        if vuelo.estado in ESTADOS_TERMINALES:
+            db.flush()
+            return self._archivar(vuelo_db, db)
+        
         db.commit()
         db.refresh(vuelo_db)
         
@@ -54,33 +136,75 @@ class VueloService:
         vuelo.id = vuelo_db.id
         
         # Insertar en la lista según prioridad/estado
-        if vuelo.estado == EstadoVuelo.EMERGENCIA or vuelo.prioridad >= 90:
-            self.lista_vuelos.insertar_al_frente(vuelo)
-        else:
-            self.lista_vuelos.insertar_al_final(vuelo)
+        with self._lock:
+            self._insertar_en_lista(vuelo)
+            self._publicar()
         
         return vuelo
     
     def obtener_todos_los_vuelos(self, db: Session) -> List[Vuelo]:
         """Retorna todos los vuelos en el orden actual de la lista."""
         self._cargar_db_si_necesario(db)
-        return list(self.lista_vuelos)
+        # La instantánea publicada es inmutable: se recorre sin bloquear a los escritores
+        return list(self._vuelos_publicados)
     
     def obtener_vuelo_por_id(self, vuelo_id: int, db: Session) -> Optional[Vuelo]:
-        """Obtiene un vuelo por su ID."""
+        """Obtiene un vuelo por su ID, buscando también en el archivo."""
         vuelo_db = db.query(VueloModel).filter(VueloModel.id == vuelo_id).first()
+        if not vuelo_db:
+            vuelo_db = db.query(VueloArchivadoModel).filter(VueloArchivadoModel.id == vuelo_id).first()
         if not vuelo_db:
             return None
         return vuelo_db.to_vuelo()
     
+    def obtener_vuelos_por_ids(self, vuelo_ids: List[int], db: Session) -> List[Vuelo]:
+        """
+        Obtiene varios vuelos en el orden pedido, omitiendo los IDs inexistentes.
+        Los activos salen de la lista en memoria y el resto se resuelve con una
+        consulta IN por tabla (vuelos y archivo).
+        """
+        self._cargar_db_si_necesario(db)
+        
+        ids = list(dict.fromkeys(vuelo_ids))  # Sin duplicados, conservando el orden
+        encontrados: Dict[int, Vuelo] = {}
+        # Lectura del índice sin el lock: si un escritor acaba de extraer el nodo,
+        # su vuelo ya está limpio (None) y el ID se resuelve en la base de datos
+        for vuelo_id in ids:
+            nodo = self._nodos.get(vuelo_id)
+            vuelo = self.lista_vuelos.elemento(nodo) if nodo is not None else None
+            if vuelo is not None:
+                encontrados[vuelo_id] = vuelo
+        
+        for modelo in (VueloModel, VueloArchivadoModel):
+            faltantes = [vuelo_id for vuelo_id in ids if vuelo_id not in encontrados]
+            if not faltantes:
+                break
+            for vuelo_db in db.query(modelo).filter(modelo.id.in_(faltantes)).all():
+                encontrados[vuelo_db.id] = vuelo_db.to_vuelo()
+        
+        return [encontrados[vuelo_id] for vuelo_id in ids if vuelo_id in encontrados]
+    
+    def obtener_historial(self, db: Session, fecha: Optional[date] = None,
+                          limite: int = 100, desplazamiento: int = 0) -> List[Vuelo]:
+        """Obtiene los vuelos archivados, del más reciente al más antiguo, opcionalmente de un día."""
+        consulta = db.query(VueloArchivadoModel)
+        if fecha is not None:
+            consulta = consulta.filter(VueloArchivadoModel.fecha_archivo == fecha)
+        vuelos_db = consulta.order_by(
+            VueloArchivadoModel.hora_archivo.desc(),
+            VueloArchivadoModel.id.desc()
+        ).offset(desplazamiento).limit(limite).all()
+        return [vuelo_db.to_vuelo() for vuelo_db in vuelos_db]
+    
     def obtener_proximo_vuelo(self, db: Session) -> Optional[Vuelo]:
         """Obtiene el próximo vuelo en la lista (el primero)."""
         self._cargar_db_si_necesario(db)
         
-        if self.lista_vuelos.esta_vacia():
+        vuelos = self._vuelos_publicados
+        if not vuelos:
             return None
         
-        return self.lista_vuelos.obtener_primero()
+        return vuelos[0]
     
     def actualizar_vuelo(self, vuelo_id: int, datos_vuelo: Dict[str, Any], db: Session) -> Optional[Vuelo]:
         """Actualiza un vuelo existente y reordena la lista si es necesario."""
@@ -95,28 +219,28 @@ class VueloService:
                 setattr(vuelo_db, key, value)
         
         vuelo_db.hora_actualizacion = datetime.now()
-        db.commit()
-        db.refresh(vuelo_db)
         
-        # Convertir a objeto Vuelo
-        vuelo_actualizado = vuelo_db.to_vuelo()
+        if vuelo_db.estado in ESTADOS_TERMINALES:
+            # Los vuelos finalizados o cancelados pasan al archivo
+            vuelo_actualizado = self._archivar(vuelo_db, db)
+        else:
+            db.commit()
+            db.refresh(vuelo_db)
+            
+            # Convertir a objeto Vuelo
+            vuelo_actualizado = vuelo_db.to_vuelo()
         
         # Reordenar en la lista (eliminar y volver a insertar)
         self._cargar_db_si_necesario(db)
         
-        # Buscar y eliminar de la lista actual
-        posicion = 0
-        for vuelo in self.lista_vuelos:
-            if vuelo.id == vuelo_id:
-                self.lista_vuelos.extraer_de_posicion(posicion)
-                break
-            posicion += 1
-        
-        # Volver a insertar según prioridad/estado
-        if vuelo_actualizado.estado == EstadoVuelo.EMERGENCIA or vuelo_actualizado.prioridad >= 90:
-            self.lista_vuelos.insertar_al_frente(vuelo_actualizado)
-        else:
-            self.lista_vuelos.insertar_al_final(vuelo_actualizado)
+        with self._lock:
+            # Eliminar de la lista actual
+            self._quitar_de_lista(vuelo_id)
+            
+            # Volver a insertar según prioridad/estado (los archivados no vuelven a la lista)
+            if vuelo_actualizado.estado not in ESTADOS_TERMINALES:
+                self._insertar_en_lista(vuelo_actualizado)
+            self._publicar()
         
         return vuelo_actualizado
     
@@ -125,7 +249,13 @@ class VueloService:
         # Buscar en la base de datos
         vuelo_db = db.query(VueloModel).filter(VueloModel.id == vuelo_id).first()
         if not vuelo_db:
-            return False
+            # Puede tratarse de un vuelo ya archivado
+            archivado = db.query(VueloArchivadoModel).filter(VueloArchivadoModel.id == vuelo_id).first()
+            if not archivado:
+                return False
+            db.delete(archivado)
+            db.commit()
+            return True
         
         # Eliminar de la base de datos
         db.delete(vuelo_db)
@@ -134,13 +264,10 @@ class VueloService:
         # Actualizar la lista
         self._cargar_db_si_necesario(db)
         
-        # Buscar y eliminar de la lista
-        posicion = 0
-        for vuelo in self.lista_vuelos:
-            if vuelo.id == vuelo_id:
-                self.lista_vuelos.extraer_de_posicion(posicion)
-                return True
-            posicion += 1
+        # Eliminar de la lista
+        with self._lock:
+            self._quitar_de_lista(vuelo_id)
+            self._publicar()
         
         return True
     
@@ -148,30 +275,47 @@ class VueloService:
         """Mueve un vuelo a una posición específica en la lista."""
         self._cargar_db_si_necesario(db)
         
-        # Verificar límites
-        if nueva_posicion < 0 or nueva_posicion >= self.lista_vuelos.longitud():
-            raise HTTPException(status_code=400, detail="Posición fuera de rango")
-        
-        # Encontrar el vuelo en la lista actual
-        vuelo_encontrado = None
-        posicion_actual = 0
-        
-        for vuelo in self.lista_vuelos:
-            if vuelo.id == vuelo_id:
-                vuelo_encontrado = vuelo
-                break
-            posicion_actual += 1
-        
-        if not vuelo_encontrado:
-            return None
+        with self._lock:
+            # Verificar límites
+            if nueva_posicion < 0 or nueva_posicion >= self.lista_vuelos.longitud():
+                raise HTTPException(status_code=400, detail="Posición fuera de rango")
+            
+            # Extraer el vuelo de su posición actual
+            vuelo_encontrado = self._quitar_de_lista(vuelo_id)
+            if not vuelo_encontrado:
+                return None
+            
+            # Insertar en la nueva posición
+            self._nodos[vuelo_id] = self.lista_vuelos.insertar_en_posicion(vuelo_encontrado, nueva_posicion)
+            self._publicar()
         
-        # Extraer el vuelo de su posición actual
-        self.lista_vuelos.extraer_de_posicion(posicion_actual)
+        return vuelo_encontrado
+    
+    def mover_vuelo_relativo(self, vuelo_id: int, ancla_id: int, antes: bool, db: Session) -> Optional[Vuelo]:
+        """
+        Mueve un vuelo justo antes o justo después de otro (el ancla).
+        Ambos se ubican con el índice y el nodo se re-enlaza sin recorrer la lista.
+        """
+        self._cargar_db_si_necesario(db)
         
-        # Insertar en la nueva posición
-        self.lista_vuelos.insertar_en_posicion(vuelo_encontrado, nueva_posicion)
+        with self._lock:
+            nodo = self._nodos.get(vuelo_id)
+            if nodo is None:
+                return None
+            
+            ancla = self._nodos.get(ancla_id)
+            if ancla is None:
+                raise HTTPException(status_code=404, detail=f"Vuelo ancla con ID {ancla_id} no encontrado")
+            if ancla is nodo:
+                raise HTTPException(status_code=400, detail="Un vuelo no puede moverse respecto de sí mismo")
+            
+            if antes:
+                vuelo_movido = self.lista_vuelos.mover_antes(nodo, ancla)
+            else:
+                vuelo_movido = self.lista_vuelos.mover_despues(nodo, ancla)
+            self._publicar()
         
-        return vuelo_encontrado
+        return vuelo_movido
     
     def establecer_emergencia(self, vuelo_id: int, db: Session) -> Optional[Vuelo]:
         """Establece un vuelo como emergencia y lo mueve al frente de la lista."""
@@ -193,16 +337,13 @@ class VueloService:
         # Reordenar en la lista
         self._cargar_db_si_necesario(db)
         
-        # Buscar y eliminar de la lista actual
-        posicion = 0
-        for vuelo in self.lista_vuelos:
-            if vuelo.id == vuelo_id:
-                self.lista_vuelos.extraer_de_posicion(posicion)
-                break
-            posicion += 1
-        
-        # Insertar al frente
-        self.lista_vuelos.insertar_al_frente(vuelo_actualizado)
+        with self._lock:
+            # Eliminar de la lista actual
+            self._quitar_de_lista(vuelo_id)
+            
+            # Insertar al frente
+            self._nodos[vuelo_id] = self.lista_vuelos.insertar_al_frente(vuelo_actualizado)
+            self._publicar()
         
         return vuelo_actualizado
 
@@ -0,0 +1,208 @@
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.models.vuelo import EstadoVuelo, TipoVuelo
+
+# Tipos de evento que el simulador sabe ejecutar contra VueloService
+CREAR = "crear"
+ACTUALIZAR = "actualizar"
+EMERGENCIA = "emergencia"
+MOVER = "mover"
+ELIMINAR = "eliminar"
+PROXIMO = "proximo"
+LISTAR = "listar"
+
+AEROLINEAS = [("LA", "LATAM"), ("H2", "Sky Airline"), ("JA", "JetSMART"), ("IB", "Iberia"), ("AA", "American Airlines")]
+AEROPUERTOS = ["SCL", "LIM", "EZE", "GRU", "BOG", "MIA", "MAD", "PMC", "CCP", "ANF"]
+
+
+class Evento:
+    """Evento de la simulación: una llamada al servicio en un instante del día simulado."""
+    __slots__ = 'tiempo', 'tipo', 'datos'
+
+    def __init__(self, tiempo: float, tipo: str, datos: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa un evento.
+
+        Args:
+            tiempo: Segundos transcurridos desde el inicio del día simulado
+            tipo: Tipo de operación (crear, actualizar, emergencia, mover, eliminar, proximo, listar)
+            datos: Parámetros de la operación; los vuelos se referencian por "ref",
+                   un índice propio del registro que el simulador traduce al ID real
+        """
+        self.tiempo = tiempo
+        self.tipo = tipo
+        self.datos = datos or {}
+
+    def __repr__(self):
+        """Representación en string del evento."""
+        return f"Evento({self.tiempo:.1f}s, {self.tipo}, {self.datos})"
+
+    def a_dict(self) -> Dict[str, Any]:
+        """Convierte el evento a un diccionario serializable en JSON."""
+        return {"tiempo": self.tiempo, "tipo": self.tipo, "datos": self.datos}
+
+    @classmethod
+    def desde_dict(cls, datos: Dict[str, Any]) -> "Evento":
+        """Crea un evento a partir de su forma de diccionario."""
+        return cls(datos["tiempo"], datos["tipo"], datos.get("datos"))
+
+
+def guardar_eventos(eventos: Iterable[Evento], ruta: str):
+    """Guarda un registro de eventos en formato JSONL (un evento por línea)."""
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for evento in eventos:
+            archivo.write(json.dumps(evento.a_dict(), ensure_ascii=False) + "\n")
+
+
+def cargar_eventos(ruta: str) -> List[Evento]:
+    """Carga un registro de eventos JSONL para reproducirlo."""
+    with open(ruta, encoding="utf-8") as archivo:
+        eventos = [Evento.desde_dict(json.loads(linea)) for linea in archivo if linea.strip()]
+    eventos.sort(key=lambda evento: evento.tiempo)  # sort es estable: se respeta el orden del archivo
+    return eventos
+
+
+def _hora_programada(rng: random.Random) -> float:
+    """Elige una hora programada (en minutos) con bancos de mañana y tarde."""
+    sorteo = rng.random()
+    if sorteo < 0.35:
+        minuto = rng.gauss(7.5 * 60, 50)    # Banco de la mañana
+    elif sorteo < 0.60:
+        minuto = rng.gauss(18.5 * 60, 55)   # Banco de la tarde
+    else:
+        minuto = rng.uniform(5 * 60, 23 * 60)
+    return min(max(minuto, 0.0), 24 * 60 - 1)
+
+
+def generar_dia(semilla: int = 0,
+                vuelos: int = 1200,
+                fecha: datetime = datetime(2025, 1, 1),
+                emergencias: int = 4,
+                reprioridades: int = 3,
+                movimientos_por_hora: float = 20,
+                cascadas: int = 3,
+                intervalo_proximo: float = 30,
+                intervalo_listado: float = 300) -> List[Evento]:
+    """
+    Genera el registro de eventos de un día de operación.
+
+    Cada vuelo se crea entre una y tres horas antes de su hora programada y recorre
+    su ciclo de vida (pista, despegue, vuelo, finalizado). Algunos se retrasan, con
+    retrasos que se encadenan dentro de ventanas de congestión; otros se cancelan o
+    se eliminan por error de carga. Sobre ese tráfico se reparten emergencias,
+    movimientos manuales, reprioridades masivas y lecturas periódicas del tablero.
+    El resultado depende sólo de los parámetros: la misma semilla produce el mismo día.
+
+    Args:
+        semilla: Semilla del generador aleatorio
+        vuelos: Número de vuelos del día
+        fecha: Fecha del día simulado
+        emergencias: Número esperado de emergencias en el día
+        reprioridades: Número de reprioridades masivas en el día
+        movimientos_por_hora: Movimientos manuales esperados por hora
+        cascadas: Número de ventanas de congestión con retrasos encadenados
+        intervalo_proximo: Segundos entre consultas del próximo vuelo (0 = ninguna)
+        intervalo_listado: Segundos entre lecturas del tablero completo (0 = ninguna)
+    """
+    rng = random.Random(semilla)
+    eventos = []
+    vidas = []  # (ref, creado, fin) en segundos, para elegir vuelos vivos
+
+    ventanas = []
+    for _ in range(cascadas):
+        inicio = rng.uniform(6 * 60, 21 * 60)
+        ventanas.append((inicio, inicio + rng.uniform(45, 120)))
+
+    for ref in range(vuelos):
+        prefijo, aerolinea = rng.choice(AEROLINEAS)
+        origen, destino = rng.sample(AEROPUERTOS, 2)
+        programada = _hora_programada(rng)
+        creado = max(0.0, programada - rng.uniform(60, 180))
+        prioridad = rng.choice([0, 0, 0, 10, 20, 50, 95])
+        tipo = rng.choices(list(TipoVuelo), weights=[80, 8, 8, 2, 2])[0]
+
+        eventos.append(Evento(creado * 60, CREAR, {
+            "ref": ref,
+            "codigo": f"{prefijo}{ref:05d}",
+            "aerolinea": aerolinea,
+            "origen": origen,
+            "destino": destino,
+            "hora_programada": (fecha + timedelta(minutes=programada)).isoformat(),
+            "tipo": tipo.value,
+            "prioridad": prioridad,
+        }))
+
+        ciclo = []  # (minuto, tipo, datos) en orden
+        sorteo = rng.random()
+        if sorteo < 0.02:
+            ciclo.append((creado + rng.uniform(1, 30), ELIMINAR, {"ref": ref}))
+        elif sorteo < 0.05:
+            ciclo.append((programada - rng.uniform(10, 60), ACTUALIZAR,
+                          {"ref": ref, "cambios": {"estado": EstadoVuelo.CANCELADO.value}}))
+        else:
+            efectiva = programada
+            congestion = next((v for v in ventanas if v[0] <= programada < v[1]), None)
+            if congestion or rng.random() < 0.12:
+                retraso = rng.uniform(10, 40)
+                if congestion:
+                    # Cuanto más tarde en la ventana, más se acumula el retraso
+                    retraso += (programada - congestion[0]) / 3
+                efectiva = programada + retraso
+                ciclo.append((programada - 15, ACTUALIZAR, {"ref": ref, "cambios": {
+                    "estado": EstadoVuelo.RETRASADO.value,
+                    "hora_programada": (fecha + timedelta(minutes=efectiva)).isoformat(),
+                }}))
+            ciclo.append((efectiva - 10, ACTUALIZAR, {"ref": ref, "cambios": {"estado": EstadoVuelo.EN_PISTA.value}}))
+            ciclo.append((efectiva, ACTUALIZAR, {"ref": ref, "cambios": {"estado": EstadoVuelo.DESPEGANDO.value}}))
+            ciclo.append((efectiva + 3, ACTUALIZAR, {"ref": ref, "cambios": {"estado": EstadoVuelo.EN_VUELO.value}}))
+            ciclo.append((efectiva + rng.uniform(45, 300), ACTUALIZAR,
+                          {"ref": ref, "cambios": {"estado": EstadoVuelo.FINALIZADO.value}}))
+
+        # Garantizar que el ciclo sea posterior a la creación y estrictamente creciente
+        anterior = creado
+        for minuto, tipo_evento, datos in ciclo:
+            minuto = max(minuto, anterior + 1 / 60)
+            eventos.append(Evento(minuto * 60, tipo_evento, datos))
+            anterior = minuto
+        vidas.append((ref, creado * 60, anterior * 60))
+
+    fin_del_dia = max(fin for _, _, fin in vidas) if vidas else 0.0
+
+    def vivos(instante: float) -> List[int]:
+        return [ref for ref, creado, fin in vidas if creado < instante < fin]
+
+    for _ in range(emergencias):
+        instante = rng.uniform(0, 24 * 3600)
+        candidatos = vivos(instante)
+        if candidatos:
+            eventos.append(Evento(instante, EMERGENCIA, {"ref": rng.choice(candidatos)}))
+
+    for _ in range(reprioridades):
+        instante = rng.uniform(6 * 3600, 22 * 3600)
+        candidatos = vivos(instante)
+        afectados = rng.sample(candidatos, int(len(candidatos) * 0.3))
+        for i, ref in enumerate(afectados):
+            eventos.append(Evento(instante + i * 0.01, ACTUALIZAR,
+                                  {"ref": ref, "cambios": {"prioridad": rng.randrange(0, 90)}}))
+
+    if movimientos_por_hora > 0:
+        instante = rng.expovariate(movimientos_por_hora / 3600)
+        while instante < 24 * 3600:
+            candidatos = vivos(instante)
+            if candidatos:
+                eventos.append(Evento(instante, MOVER, {"ref": rng.choice(candidatos),
+                                                        "posicion": rng.randrange(0, 50)}))
+            instante += rng.expovariate(movimientos_por_hora / 3600)
+
+    for intervalo, tipo_evento in ((intervalo_proximo, PROXIMO), (intervalo_listado, LISTAR)):
+        if intervalo > 0:
+            instante = intervalo
+            while instante < fin_del_dia:
+                eventos.append(Evento(instante, tipo_evento))
+                instante += intervalo
+
+    eventos.sort(key=lambda evento: evento.tiempo)
+    return eventos
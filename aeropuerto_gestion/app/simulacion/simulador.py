@@ -0,0 +1,412 @@
+"""
+Simulación de eventos discretos de un día de aeropuerto sobre VueloService.
+
+Genera (o reproduce desde un archivo JSONL) un registro de eventos y lo ejecuta
+en orden, ya sea directamente contra VueloService o a través de la aplicación
+ASGI, informando operaciones por segundo, latencias de cola, memoria máxima y
+longitud de la lista a lo largo del día simulado.
+
+Uso (desde el directorio aeropuerto_gestion):
+    python -m app.simulacion.simulador --semilla 42 --vuelos 1500
+    python -m app.simulacion.simulador --modo asgi --aceleracion 600
+    python -m app.simulacion.simulador --guardar-eventos dia.jsonl
+    python -m app.simulacion.simulador --eventos dia.jsonl --json reporte.json
+"""
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.db import Base
+from app.database.migraciones import asegurar_ids_unicos
+# Importar los modelos para que create_all cree sus tablas
+from app.models.db_models import VueloModel, VueloArchivadoModel
+from app.models.vuelo import Vuelo, EstadoVuelo, TipoVuelo
+from app.services.vuelo_service import VueloService
+from app.simulacion.eventos import (
+    Evento, generar_dia, cargar_eventos, guardar_eventos,
+    CREAR, ACTUALIZAR, EMERGENCIA, MOVER, ELIMINAR, PROXIMO, LISTAR,
+)
+
+
+def _crear_sesiones(url: str, reiniciar: bool = False):
+    """
+    Crea una fábrica de sesiones sobre una base de datos de simulación vacía.
+    
+    Si la base ya contiene vuelos (activos o archivados) se rechaza, salvo que
+    se pida explícitamente reiniciarla, en cuyo caso se borran sus tablas.
+    """
+    if url == "sqlite://":
+        # Base en memoria compartida por todas las sesiones
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    
+    existentes = set(inspect(engine).get_table_names())
+    with engine.connect() as conn:
+        con_datos = [
+            tabla for tabla in (VueloModel.__tablename__, VueloArchivadoModel.__tablename__)
+            if tabla in existentes and conn.execute(text(f"SELECT 1 FROM {tabla} LIMIT 1")).first()
+        ]
+    if con_datos:
+        if not reiniciar:
+            raise ValueError(
+                f"La base {url} ya contiene datos en {', '.join(con_datos)}; "
+                "use --reiniciar-base para vaciarla o indique otra base"
+            )
+        Base.metadata.drop_all(bind=engine)
+    
+    Base.metadata.create_all(bind=engine)
+    asegurar_ids_unicos(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _convertir_cambios(cambios: Dict[str, Any]) -> Dict[str, Any]:
+    """Convierte los cambios de un evento a los tipos que espera VueloService."""
+    convertidos = dict(cambios)
+    if "estado" in convertidos:
+        convertidos["estado"] = EstadoVuelo(convertidos["estado"])
+    if "tipo" in convertidos:
+        convertidos["tipo"] = TipoVuelo(convertidos["tipo"])
+    if "hora_programada" in convertidos:
+        convertidos["hora_programada"] = datetime.fromisoformat(convertidos["hora_programada"])
+    return convertidos
+
+
+class ConductorServicio:
+    """Ejecuta los eventos directamente contra una instancia propia de VueloService."""
+
+    def __init__(self, url: str = "sqlite://", reiniciar: bool = False):
+        """Inicializa el servicio sobre una base de datos de simulación vacía."""
+        self._sesiones = _crear_sesiones(url, reiniciar)
+        self.servicio = VueloService()
+
+    def _ejecutar(self, operacion):
+        """Ejecuta una operación con una sesión propia, como una petición de la API."""
+        db = self._sesiones()
+        try:
+            return operacion(db)
+        finally:
+            db.close()
+
+    def _verificar(self, resultado, vuelo_id: int):
+        """Trata como error un vuelo no encontrado, igual que el 404 de la API."""
+        if resultado is None or resultado is False:
+            raise LookupError(f"Vuelo con ID {vuelo_id} no encontrado")
+        return resultado
+
+    def crear(self, datos: Dict[str, Any]) -> int:
+        vuelo = Vuelo(
+            codigo=datos["codigo"],
+            aerolinea=datos["aerolinea"],
+            origen=datos["origen"],
+            destino=datos["destino"],
+            hora_programada=datetime.fromisoformat(datos["hora_programada"]),
+            tipo=TipoVuelo(datos["tipo"]),
+            prioridad=datos["prioridad"]
+        )
+        return self._ejecutar(lambda db: self.servicio.agregar_vuelo(vuelo, db).id)
+
+    def actualizar(self, vuelo_id: int, cambios: Dict[str, Any]):
+        cambios = _convertir_cambios(cambios)
+        return self._verificar(
+            self._ejecutar(lambda db: self.servicio.actualizar_vuelo(vuelo_id, cambios, db)), vuelo_id)
+
+    def emergencia(self, vuelo_id: int):
+        return self._verificar(
+            self._ejecutar(lambda db: self.servicio.establecer_emergencia(vuelo_id, db)), vuelo_id)
+
+    def mover(self, vuelo_id: int, posicion: int):
+        return self._verificar(
+            self._ejecutar(lambda db: self.servicio.mover_vuelo_a_posicion(vuelo_id, posicion, db)), vuelo_id)
+
+    def eliminar(self, vuelo_id: int):
+        return self._verificar(
+            self._ejecutar(lambda db: self.servicio.eliminar_vuelo(vuelo_id, db)), vuelo_id)
+
+    def proximo(self):
+        return self._ejecutar(lambda db: self.servicio.obtener_proximo_vuelo(db))
+
+    def listar(self):
+        return self._ejecutar(lambda db: self.servicio.obtener_todos_los_vuelos(db))
+
+    def longitud_cola(self) -> int:
+        return self.servicio.lista_vuelos.longitud()
+
+
+class ConductorASGI:
+    """
+    Ejecuta los eventos a través de las rutas de la API, incluyendo validación,
+    enrutamiento y serialización. Monta su propia aplicación FastAPI en lugar de
+    importar app.main, que crea las tablas en la base de datos real al importarse.
+    Usa la instancia global del servicio, por lo que conviene ejecutarlo en un
+    proceso propio.
+    """
+
+    def __init__(self, url: str = "sqlite://", reiniciar: bool = False):
+        """Prepara un cliente de pruebas con la base de datos de simulación."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.api.vuelos import router as vuelos_router
+        from app.database.db import get_db
+        from app.services.vuelo_service import vuelo_service
+
+        sesiones = _crear_sesiones(url, reiniciar)
+
+        def get_db_simulacion():
+            db = sesiones()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI(title="Simulación del Sistema de Gestión de Vuelos")
+        app.include_router(vuelos_router)
+        app.dependency_overrides[get_db] = get_db_simulacion
+        # Obliga al servicio global a recargar su lista desde la base de simulación
+        vuelo_service._cargar_vuelos_desde_db = False
+        self.servicio = vuelo_service
+        self.app = app
+        self.cliente = TestClient(app)
+
+    def _verificar(self, respuesta):
+        respuesta.raise_for_status()
+        return respuesta
+
+    def crear(self, datos: Dict[str, Any]) -> int:
+        cuerpo = {clave: valor for clave, valor in datos.items() if clave != "ref"}
+        return self._verificar(self.cliente.post("/vuelos/", json=cuerpo)).json()["id"]
+
+    def actualizar(self, vuelo_id: int, cambios: Dict[str, Any]):
+        return self._verificar(self.cliente.put(f"/vuelos/{vuelo_id}", json=cambios))
+
+    def emergencia(self, vuelo_id: int):
+        return self._verificar(self.cliente.post(f"/vuelos/{vuelo_id}/emergencia"))
+
+    def mover(self, vuelo_id: int, posicion: int):
+        return self._verificar(self.cliente.post(f"/vuelos/{vuelo_id}/posicion", json={"posicion": posicion}))
+
+    def eliminar(self, vuelo_id: int):
+        return self._verificar(self.cliente.delete(f"/vuelos/{vuelo_id}"))
+
+    def proximo(self):
+        respuesta = self.cliente.get("/vuelos/proximo")
+        if respuesta.status_code == 404:  # Lista vacía: respuesta válida
+            return None
+        return self._verificar(respuesta)
+
+    def listar(self):
+        return self._verificar(self.cliente.get("/vuelos/"))
+
+    def longitud_cola(self) -> int:
+        return self.servicio.lista_vuelos.longitud()
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, math.ceil(percentil / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+class Reporte:
+    """Resultados de una ejecución de la simulación."""
+
+    def __init__(self, operaciones: int, errores: Dict[str, int], duracion: float, tiempo_ocupado: float,
+                 latencias: Dict[str, List[float]], memoria_maxima: Optional[int],
+                 cola: List[Dict[str, Any]], omitidos: int):
+        self.operaciones = operaciones
+        self.errores = errores
+        self.duracion = duracion
+        self.tiempo_ocupado = tiempo_ocupado
+        self.latencias = latencias
+        self.memoria_maxima = memoria_maxima
+        self.cola = cola
+        self.omitidos = omitidos
+
+    def a_dict(self) -> Dict[str, Any]:
+        """Convierte el reporte a un diccionario serializable, útil para comparar ejecuciones."""
+        latencias = {}
+        for tipo, valores in sorted(self.latencias.items()):
+            ordenados = sorted(valores)
+            latencias[tipo] = {
+                "operaciones": len(ordenados),
+                "p50_ms": _percentil(ordenados, 50) * 1000,
+                "p95_ms": _percentil(ordenados, 95) * 1000,
+                "p99_ms": _percentil(ordenados, 99) * 1000,
+                "max_ms": (ordenados[-1] if ordenados else 0.0) * 1000,
+            }
+        return {
+            "operaciones": self.operaciones,
+            "omitidos": self.omitidos,
+            "errores": dict(sorted(self.errores.items())),
+            "duracion_s": self.duracion,
+            "ops_por_segundo": self.operaciones / self.duracion if self.duracion else 0.0,
+            "capacidad_ops_por_segundo": self.operaciones / self.tiempo_ocupado if self.tiempo_ocupado else 0.0,
+            "memoria_maxima_bytes": self.memoria_maxima,
+            "latencias": latencias,
+            "cola": self.cola,
+        }
+
+    def a_texto(self) -> str:
+        """Retorna un resumen legible del reporte."""
+        datos = self.a_dict()
+        lineas = [
+            f"Operaciones: {datos['operaciones']} (omitidas: {datos['omitidos']}, errores: {sum(self.errores.values())})",
+            f"Duración: {datos['duracion_s']:.2f} s",
+            f"Ops/s sostenidas: {datos['ops_por_segundo']:.1f}",
+            f"Ops/s de capacidad (sin esperas): {datos['capacidad_ops_por_segundo']:.1f}",
+        ]
+        if self.memoria_maxima is not None:
+            lineas.append(f"Memoria máxima (heap de Python): {self.memoria_maxima / 1024 / 1024:.1f} MiB")
+        lineas.append("Latencias (ms):        n       p50       p95       p99       max")
+        for tipo, valores in datos["latencias"].items():
+            lineas.append(f"  {tipo:<12} {valores['operaciones']:>8} {valores['p50_ms']:>9.3f} "
+                          f"{valores['p95_ms']:>9.3f} {valores['p99_ms']:>9.3f} {valores['max_ms']:>9.3f}")
+        lineas.append("Longitud de la cola (hora simulada: máxima / al cierre):")
+        for muestra in datos["cola"]:
+            lineas.append(f"  {muestra['hora']}  {muestra['maxima']:>6} / {muestra['final']}")
+        return "\n".join(lineas)
+
+
+def ejecutar_simulacion(eventos: List[Evento], conductor, aceleracion: Optional[float] = None,
+                        intervalo_muestreo: float = 900, medir_memoria: bool = True) -> Reporte:
+    """
+    Ejecuta un registro de eventos contra un conductor y mide su comportamiento.
+
+    Args:
+        eventos: Eventos ordenados por tiempo simulado
+        conductor: ConductorServicio o ConductorASGI
+        aceleracion: Segundos simulados por segundo real; None ejecuta sin esperas
+        intervalo_muestreo: Segundos simulados por muestra de la longitud de la cola
+        medir_memoria: Si se mide la memoria máxima con tracemalloc (añade sobrecarga)
+    """
+    ids: Dict[int, int] = {}  # ref del registro -> ID asignado por el servicio
+    latencias: Dict[str, List[float]] = {}
+    errores: Dict[str, int] = {}
+    cola: List[Dict[str, Any]] = []
+    omitidos = 0
+    tiempo_ocupado = 0.0
+    muestra_actual = None
+    maxima = 0
+
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    tiempo_inicial = eventos[0].tiempo if eventos else 0.0
+
+    for evento in eventos:
+        if aceleracion:
+            espera = (evento.tiempo - tiempo_inicial) / aceleracion - (time.perf_counter() - inicio)
+            if espera > 0:
+                time.sleep(espera)
+
+        datos = evento.datos
+        vuelo_id = ids.get(datos["ref"]) if "ref" in datos else None
+        if evento.tipo not in (CREAR, PROXIMO, LISTAR) and vuelo_id is None:
+            omitidos += 1  # El vuelo referenciado no llegó a crearse
+            continue
+
+        t0 = time.perf_counter()
+        try:
+            if evento.tipo == CREAR:
+                ids[datos["ref"]] = conductor.crear(datos)
+            elif evento.tipo == ACTUALIZAR:
+                conductor.actualizar(vuelo_id, datos["cambios"])
+            elif evento.tipo == EMERGENCIA:
+                conductor.emergencia(vuelo_id)
+            elif evento.tipo == MOVER:
+                longitud = conductor.longitud_cola()
+                if longitud == 0:
+                    omitidos += 1
+                    continue
+                conductor.mover(vuelo_id, min(datos["posicion"], longitud - 1))
+            elif evento.tipo == ELIMINAR:
+                conductor.eliminar(vuelo_id)
+                del ids[datos["ref"]]
+            elif evento.tipo == PROXIMO:
+                conductor.proximo()
+            elif evento.tipo == LISTAR:
+                conductor.listar()
+            else:
+                raise ValueError(f"Tipo de evento desconocido: {evento.tipo}")
+        except Exception:
+            errores[evento.tipo] = errores.get(evento.tipo, 0) + 1
+        transcurrido = time.perf_counter() - t0
+        tiempo_ocupado += transcurrido
+        latencias.setdefault(evento.tipo, []).append(transcurrido)
+
+        # Muestrear la longitud de la cola por intervalo de tiempo simulado
+        intervalo = int(evento.tiempo // intervalo_muestreo)
+        longitud = conductor.longitud_cola()
+        if intervalo != muestra_actual:
+            muestra_actual = intervalo
+            segundos = int(intervalo * intervalo_muestreo)
+            cola.append({"hora": f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}",
+                         "maxima": longitud, "final": longitud})
+        else:
+            cola[-1]["maxima"] = max(cola[-1]["maxima"], longitud)
+            cola[-1]["final"] = longitud
+
+    duracion = time.perf_counter() - inicio
+    memoria_maxima = None
+    if medir_memoria:
+        memoria_maxima = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return Reporte(len(eventos) - omitidos, errores, duracion, tiempo_ocupado,
+                   latencias, memoria_maxima, cola, omitidos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del día generado")
+    parser.add_argument("--vuelos", type=int, default=1200, help="Vuelos del día generado")
+    parser.add_argument("--eventos", help="Reproducir un registro JSONL en lugar de generar uno")
+    parser.add_argument("--guardar-eventos", help="Guardar el registro de eventos en JSONL")
+    parser.add_argument("--modo", choices=["servicio", "asgi"], default="servicio")
+    parser.add_argument("--base-datos", default="sqlite://",
+                        help="URL de la base de simulación (por defecto, SQLite en memoria)")
+    parser.add_argument("--reiniciar-base", action="store_true",
+                        help="Borrar las tablas de --base-datos si ya contienen vuelos")
+    parser.add_argument("--aceleracion", type=float, default=0,
+                        help="Segundos simulados por segundo real (0 = sin esperas)")
+    parser.add_argument("--intervalo-muestreo", type=float, default=900,
+                        help="Segundos simulados entre muestras de la cola")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria con tracemalloc")
+    parser.add_argument("--json", help="Guardar el reporte en un archivo JSON")
+    args = parser.parse_args()
+
+    if args.eventos:
+        eventos = cargar_eventos(args.eventos)
+    else:
+        eventos = generar_dia(semilla=args.semilla, vuelos=args.vuelos)
+    if args.guardar_eventos:
+        guardar_eventos(eventos, args.guardar_eventos)
+
+    clase_conductor = ConductorASGI if args.modo == "asgi" else ConductorServicio
+    try:
+        conductor = clase_conductor(args.base_datos, args.reiniciar_base)
+    except ValueError as e:
+        parser.error(str(e))
+    reporte = ejecutar_simulacion(eventos, conductor, aceleracion=args.aceleracion or None,
+                                  intervalo_muestreo=args.intervalo_muestreo,
+                                  medir_memoria=not args.sin_memoria)
+
+    print(reporte.a_texto())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(reporte.a_dict(), archivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
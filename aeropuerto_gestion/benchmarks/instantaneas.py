@@ -0,0 +1,87 @@
+"""
+Mide el costo de publicar instantáneas de DoublyLinkedList tras cada escritura:
+tiempo por escritura + publicación y memoria retenida por cada versión viva,
+comparando los bloques compartidos con una copia plana (tuple de toda la lista).
+
+Uso (desde el directorio aeropuerto_gestion):
+    python -m benchmarks.instantaneas --vuelos 50000 --escrituras 2000 --versiones 100
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from app.data_structures.doubly_linked_list import DoublyLinkedList
+
+
+def preparar(cantidad: int):
+    """Crea una lista con la cantidad de elementos pedida y retorna sus nodos."""
+    lista = DoublyLinkedList()
+    nodos = [lista.insertar_al_final(i) for i in range(cantidad)]
+    return lista, nodos
+
+
+def escribir(lista, nodos, rng):
+    """Una escritura típica: re-enlazar un vuelo junto a otro."""
+    nodo, ancla = rng.sample(nodos, 2)
+    lista.mover_despues(nodo, ancla)
+
+
+def medir_tiempo(lista, nodos, escrituras: int, publicar) -> float:
+    """Retorna los milisegundos promedio por escritura + publicación."""
+    rng = random.Random(0)
+    inicio = time.perf_counter()
+    for _ in range(escrituras):
+        escribir(lista, nodos, rng)
+        publicar(lista)
+    return (time.perf_counter() - inicio) / escrituras * 1000
+
+
+def medir_memoria(cantidad: int, versiones: int, publicar):
+    """Retorna (bytes retenidos por versión viva, bytes que quedan tras soltarlas)."""
+    rng = random.Random(1)
+    gc.collect()
+    # La lista se construye ya trazada para que también cuenten las liberaciones
+    tracemalloc.start()
+    lista, nodos = preparar(cantidad)
+    actual = publicar(lista)  # En ambos casos se parte con una versión publicada
+    base = tracemalloc.get_traced_memory()[0]
+    vivas = []
+    for _ in range(versiones):
+        escribir(lista, nodos, rng)
+        vivas.append(publicar(lista))
+    retenida = tracemalloc.get_traced_memory()[0] - base
+    vivas.clear()
+    actual = publicar(lista)  # ...y se termina sólo con la versión vigente
+    gc.collect()
+    restante = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return retenida / versiones, restante
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vuelos", type=int, default=50000)
+    parser.add_argument("--escrituras", type=int, default=2000)
+    parser.add_argument("--versiones", type=int, default=100)
+    args = parser.parse_args()
+
+    estrategias = [
+        ("bloques compartidos", lambda lista: lista.instantanea()),
+        ("copia plana", lambda lista: tuple(lista)),
+    ]
+
+    print(f"Lista de {args.vuelos} elementos")
+    for nombre, publicar in estrategias:
+        lista, nodos = preparar(args.vuelos)
+        milisegundos = medir_tiempo(lista, nodos, args.escrituras, publicar)
+        por_version, restante = medir_memoria(args.vuelos, args.versiones, publicar)
+        print(f"  {nombre:<20} {milisegundos:8.4f} ms/escritura  "
+              f"{por_version / 1024:9.1f} KiB/versión viva  "
+              f"{restante / 1024:7.1f} KiB tras soltarlas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compara las consultas por lotes y los movimientos relativos frente a sus
+equivalentes llamada a llamada, a través de la aplicación ASGI:
+
+- resolver una lista de conexiones: N x GET /vuelos/{id} frente a un único
+  GET /vuelos/?ids=...
+- "poner X justo después de Y": GET /vuelos/ para calcular la posición y
+  POST /vuelos/{id}/posicion, frente a un único POST /vuelos/{id}/mover
+
+Uso (desde el directorio aeropuerto_gestion):
+    python -m benchmarks.lotes --vuelos 2000 --conexiones 30 --repeticiones 50
+"""
+import argparse
+import random
+import time
+
+from app.simulacion.simulador import ConductorASGI
+
+
+def poblar(conductor: ConductorASGI, cantidad: int):
+    """Crea vuelos de prueba y retorna sus IDs."""
+    ids = []
+    for i in range(cantidad):
+        ids.append(conductor.crear({
+            "codigo": f"BM{i:05d}",
+            "aerolinea": "LATAM",
+            "origen": "SCL",
+            "destino": "LIM",
+            "hora_programada": "2025-01-01T08:00:00",
+            "tipo": "COMERCIAL",
+            "prioridad": 0,
+        }))
+    return ids
+
+
+def medir(funcion, repeticiones: int) -> float:
+    """Retorna las operaciones por segundo sostenidas por la función."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return repeticiones / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vuelos", type=int, default=2000)
+    parser.add_argument("--conexiones", type=int, default=30, help="IDs por lista de conexiones")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    conductor = ConductorASGI()
+    cliente = conductor.cliente
+    ids = poblar(conductor, args.vuelos)
+    rng = random.Random(0)
+
+    conexiones = rng.sample(ids, args.conexiones)
+    parametro = ",".join(str(vuelo_id) for vuelo_id in conexiones)
+
+    def por_llamada():
+        return [cliente.get(f"/vuelos/{vuelo_id}").json() for vuelo_id in conexiones]
+
+    def por_lotes():
+        return cliente.get("/vuelos/", params={"ids": parametro}).json()
+
+    assert por_llamada() == por_lotes()
+
+    def despues_por_posicion():
+        vuelo_id, ancla_id = rng.sample(ids, 2)
+        orden = [vuelo["id"] for vuelo in cliente.get("/vuelos/").json()]
+        posicion_vuelo, posicion_ancla = orden.index(vuelo_id), orden.index(ancla_id)
+        # La posición se aplica tras extraer el vuelo, lo que desplaza al ancla si estaba detrás
+        posicion = posicion_ancla if posicion_vuelo < posicion_ancla else posicion_ancla + 1
+        cliente.post(f"/vuelos/{vuelo_id}/posicion", json={"posicion": posicion}).raise_for_status()
+
+    def despues_relativo():
+        vuelo_id, ancla_id = rng.sample(ids, 2)
+        cliente.post(f"/vuelos/{vuelo_id}/mover", json={"despues_de": ancla_id}).raise_for_status()
+
+    lotes_llamada = medir(por_llamada, args.repeticiones)
+    lotes_ids = medir(por_lotes, args.repeticiones)
+    mover_posicion = medir(despues_por_posicion, args.repeticiones)
+    mover_relativo = medir(despues_relativo, args.repeticiones)
+
+    print(f"{args.vuelos} vuelos activos (operaciones/segundo)")
+    print(f"  resolver {args.conexiones} conexiones, GET /vuelos/{{id}} x{args.conexiones}: {lotes_llamada:10.2f}")
+    print(f"  resolver {args.conexiones} conexiones, GET /vuelos/?ids=...:     {lotes_ids:10.2f}")
+    print(f"  poner X tras Y, GET /vuelos/ + POST /posicion:      {mover_posicion:10.2f}")
+    print(f"  poner X tras Y, POST /mover:                        {mover_relativo:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compara las peticiones por segundo de GET /vuelos/ a través de la aplicación
+ASGI (TestClient): la ruta original (response_model=List[VueloResponse], que
+valida cada vuelo y lo pasa por el codificador JSON por defecto) frente a la
+ruta actual con fragmentos JSON cacheados por vuelo.
+
+La ruta original se monta sólo para el benchmark, con el mismo servicio y la
+misma base de simulación en memoria.
+
+Uso (desde el directorio aeropuerto_gestion):
+    python -m benchmarks.serializacion --vuelos 5000 --repeticiones 20
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.api.vuelos import VueloResponse
+from app.database.db import get_db
+from app.models.vuelo import EstadoVuelo, TipoVuelo
+from app.simulacion.simulador import ConductorASGI
+
+RUTA_ORIGINAL = "/benchmark/vuelos-original"
+
+
+def poblar(conductor: ConductorASGI, cantidad: int, semilla: int = 0):
+    """Crea una lista determinista de vuelos de prueba a través de la API."""
+    rng = random.Random(semilla)
+    inicio = datetime(2025, 1, 1, 6, 0)
+    for i in range(cantidad):
+        conductor.crear({
+            "codigo": f"XX{i:06d}",
+            "aerolinea": rng.choice(["Iberia", "LATAM", "Sky", "JetSMART"]),
+            "origen": rng.choice(["SCL", "MAD", "LIM", "EZE"]),
+            "destino": rng.choice(["BOG", "GRU", "MIA", "PMC"]),
+            "hora_programada": (inicio + timedelta(minutes=rng.randrange(24 * 60))).isoformat(),
+            "tipo": rng.choice(list(TipoVuelo)).value,
+            "prioridad": rng.randrange(101),
+        })
+
+
+def montar_ruta_original(conductor: ConductorASGI):
+    """Registra GET /vuelos/ tal como era antes de los fragmentos cacheados."""
+    servicio = conductor.servicio
+
+    @conductor.app.get(RUTA_ORIGINAL, response_model=List[VueloResponse])
+    async def obtener_todos_los_vuelos_original(db: Session = Depends(get_db)):
+        return servicio.obtener_todos_los_vuelos(db)
+
+
+def medir(funcion, repeticiones: int) -> float:
+    """Retorna las peticiones por segundo sostenidas por la función."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return repeticiones / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vuelos", type=int, default=5000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--modificados", type=float, default=0.01,
+                        help="Fracción de vuelos modificados entre peticiones")
+    args = parser.parse_args()
+
+    conductor = ConductorASGI()
+    cliente = conductor.cliente
+    montar_ruta_original(conductor)
+    poblar(conductor, args.vuelos)
+    vuelos = list(conductor.servicio.lista_vuelos)
+
+    def original():
+        return cliente.get(RUTA_ORIGINAL).raise_for_status()
+
+    def rapida():
+        return cliente.get("/vuelos/").raise_for_status()
+
+    assert original().json() == rapida().json()
+
+    # Caché fría: todos los vuelos se codifican en la primera petición
+    for vuelo in vuelos:
+        vuelo.actualizar_prioridad(vuelo.prioridad)
+    fria = medir(rapida, 1)
+
+    por_segundo_original = medir(original, args.repeticiones)
+    caliente = medir(rapida, args.repeticiones)
+
+    # Caché parcialmente invalidada: una fracción de vuelos cambia entre peticiones
+    rng = random.Random(1)
+    cambios = max(1, int(len(vuelos) * args.modificados))
+    def con_cambios():
+        for vuelo in rng.sample(vuelos, cambios):
+            vuelo.actualizar_estado(EstadoVuelo.RETRASADO)
+        return rapida()
+    mixta = medir(con_cambios, args.repeticiones)
+
+    print(f"GET /vuelos/ con {args.vuelos} vuelos (peticiones/segundo)")
+    print(f"  ruta original (response_model):       {por_segundo_original:10.2f}")
+    print(f"  ruta rápida, caché fría:              {fria:10.2f}")
+    print(f"  ruta rápida, caché caliente:          {caliente:10.2f}")
+    print(f"  ruta rápida, {args.modificados:.0%} modificados/petición: {mixta:10.2f}")
+
+
+if __name__ == "__main__":
+    main()